@@ -0,0 +1,90 @@
+"""Persistent on-disk cache for candles."""
+
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Optional
+from diskcache import Cache
+import config
+from candles import Candles
+
+
+# Directory holding the cache, survives restarts of the monitor
+CACHE_DIR = '.candle_cache'
+
+# Sources candles are built from. They differ in timestamps (UTC vs
+# exchange-local) and in how 1wk/1mo bars are formed, so each has its own keys
+CHART = 'chart'        # Yahoo's chart endpoint, native bars
+DOWNLOAD = 'download'  # yf.download, bars resampled in-process
+
+# Length of a bar for the intraday and daily timeframes, in seconds
+BAR_SECONDS = MappingProxyType({
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '4h': 4 * 3600,
+    '1d': 86400
+})
+
+_cache = Cache(CACHE_DIR)
+
+
+def get_candles(ticker: str, timeframe: str, periods: int, source: str) -> Optional[Candles]:
+    """
+    Returns cached candles for a ticker and timeframe.
+
+    Args:
+        ticker: Ticker symbol
+        timeframe: Timeframe (e.g., '4h', '1d', '1wk', '1mo')
+        periods: Number of periods requested
+        source: CHART or DOWNLOAD
+
+    Returns:
+        Candles, or None if not cached or expired
+    """
+    return _cache.get(('ohlcv', source, ticker, timeframe, periods))
+
+
+def set_candles(ticker: str, timeframe: str, periods: int, source: str, candles: Candles) -> None:
+    """
+    Caches candles until the timeframe's next bar opens, at most for its cache duration.
+
+    Args:
+        ticker: Ticker symbol
+        timeframe: Timeframe (e.g., '4h', '1d', '1wk', '1mo')
+        periods: Number of periods requested
+        source: CHART or DOWNLOAD
+        candles: Candles to cache
+    """
+    ttl = config.CANDLE_CACHE_DURATION.get(timeframe, config.DEFAULT_CANDLE_CACHE_DURATION)
+    until_next_bar = _seconds_until_next_bar(timeframe, datetime.now(timezone.utc))
+    if until_next_bar is not None:
+        ttl = min(ttl, max(until_next_bar, 1))
+    _cache.set(('ohlcv', source, ticker, timeframe, periods), candles, expire=ttl)
+
+
+def _seconds_until_next_bar(timeframe: str, now: datetime) -> Optional[float]:
+    """
+    Returns the time left until the next bar of a timeframe opens.
+
+    Bars are assumed to open on UTC boundaries (midnight, Monday, the 1st of
+    the month), which is exact for crypto and close for the other markets.
+
+    Args:
+        timeframe: Timeframe (e.g., '4h', '1d', '1wk', '1mo')
+        now: Current time, timezone-aware
+
+    Returns:
+        Seconds until the next bar, or None for an unknown timeframe
+    """
+    if timeframe in BAR_SECONDS:
+        seconds = BAR_SECONDS[timeframe]
+        return seconds - now.timestamp() % seconds
+
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if timeframe == '1wk':
+        next_bar = midnight + timedelta(days=7 - now.weekday())
+    elif timeframe == '1mo':
+        next_bar = midnight.replace(day=1, month=now.month % 12 + 1, year=now.year + now.month // 12)
+    else:
+        return None
+    return (next_bar - now).total_seconds()
@@ -0,0 +1,71 @@
+"""Struct-of-arrays container for candle data."""
+
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass(eq=False)
+class Candles:
+    """
+    OHLCV candles stored as one NumPy array per field (oldest to newest).
+
+    Attributes:
+        ts: Candle timestamps (datetime64)
+        open: Open prices
+        high: High prices
+        low: Low prices
+        close: Close prices
+        volume: Volumes
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def tail(self, periods: int) -> 'Candles':
+        """
+        Returns the last `periods` candles as views into the same arrays.
+
+        Args:
+            periods: Number of most recent candles to keep
+
+        Returns:
+            Candles sharing memory with this instance
+        """
+        return Candles(
+            ts=self.ts[-periods:],
+            open=self.open[-periods:],
+            high=self.high[-periods:],
+            low=self.low[-periods:],
+            close=self.close[-periods:],
+            volume=self.volume[-periods:]
+        )
+
+    @classmethod
+    def from_frame(cls, df) -> 'Candles':
+        """
+        Builds Candles from a yfinance OHLCV DataFrame without a Python row loop.
+
+        Float64 columns are exposed without copying, so pair this with tail()
+        rather than slicing the DataFrame first.
+
+        Args:
+            df: DataFrame with 'Open', 'High', 'Low', 'Close', 'Volume' columns
+                and a DatetimeIndex
+
+        Returns:
+            Candles holding the DataFrame's columns as float64 arrays
+        """
+        return cls(
+            ts=df.index.values,
+            open=df['Open'].to_numpy(dtype=np.float64),
+            high=df['High'].to_numpy(dtype=np.float64),
+            low=df['Low'].to_numpy(dtype=np.float64),
+            close=df['Close'].to_numpy(dtype=np.float64),
+            volume=df['Volume'].to_numpy(dtype=np.float64)
+        )
@@ -1,5 +1,7 @@
 """Configuration settings for the trading strategy monitor."""
 
+from types import MappingProxyType
+
 # List of tickers to monitor
 TICKERS = [
     "EURUSD=X",
@@ -59,9 +61,70 @@ LOOKBACK_PERIODS = {
 # Default lookback if not specified
 DEFAULT_LOOKBACK = 100
 
+# Map timeframe to yfinance interval
+INTERVAL_MAP = MappingProxyType({
+    '5m': '5m',
+    '15m': '15m',
+    '1h': '1h',
+    '4h': '1h',  # yfinance doesn't have 4h, we'll aggregate 1h
+    '1d': '1d',
+    '1wk': '1wk',
+    '1mo': '1mo'
+})
+
+# History period to request per timeframe
+PERIOD_MAP = MappingProxyType({
+    '5m': '7d',
+    '15m': '1mo',
+    '1h': '2mo',
+    '4h': '6mo',
+    '1d': '1y',
+    '1wk': '2y',
+    '1mo': '5y'
+})
+
+# Display names for timeframes
+TF_NAMES = MappingProxyType({
+    '5m': '5 Minutes',
+    '15m': '15 Minutes',
+    '1h': '1 Hour',
+    '4h': '4 Hours',
+    '1d': 'Daily',
+    '1wk': 'Weekly',
+    '1mo': 'Monthly'
+})
+
+# Sort order for timeframes in grouped alerts (higher timeframes first)
+TIMEFRAME_PRIORITY = MappingProxyType({
+    '1mo': 0,
+    '1wk': 1,
+    '1d': 2,
+    '4h': 3,
+    '1h': 4,
+    '15m': 5,
+    '5m': 6
+})
+
 # Maximum number of parallel workers for concurrent processing
 MAX_WORKERS = 10
 
 # Cache duration for security names (in seconds)
 SECURITY_NAME_CACHE_DURATION = 86400  # 24 hours
 
+# Time before a failed security name lookup is retried (in seconds)
+SECURITY_NAME_RETRY_DURATION = 300  # 5 minutes
+
+# Cache duration for fetched candles per timeframe (in seconds), cut short
+# when the next bar opens
+CANDLE_CACHE_DURATION = {
+    '5m': 60,
+    '15m': 300,
+    '1h': 900,
+    '4h': 3600,
+    '1d': 21600,
+    '1wk': 86400,
+    '1mo': 86400 * 3
+}
+
+# Default candle cache duration if timeframe not specified
+DEFAULT_CANDLE_CACHE_DURATION = 300
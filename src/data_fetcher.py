@@ -1,10 +1,45 @@
 """Module for fetching market data."""
 
-from typing import Optional, List, Dict
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Optional, List, Dict, Tuple
+import httpx
+import pandas as pd
 import yfinance as yf
+import config
+from yf_session import get_session, get_yfinance_session
+import candle_cache
+from candles import Candles
+from singleflight import SingleFlight
+from yahoo_chart import chart_request, parse_chart, fetch_chart
 
 
-def fetch_candles(ticker: str, timeframe: str = '1h', periods: int = 100) -> Optional[List[Dict]]:
+# Periods of config.PERIOD_MAP in ascending order of length
+PERIOD_ORDER = ('7d', '1mo', '2mo', '6mo', '1y', '2y', '5y')
+
+# Finest interval each timeframe can be derived from in fetch_all_timeframes_bulk
+BASE_INTERVAL_MAP = MappingProxyType({
+    '5m': '5m',
+    '15m': '15m',
+    '1h': '1h',
+    '4h': '1h',
+    '1d': '1d',
+    '1wk': '1d',
+    '1mo': '1d'
+})
+
+# Pandas resample rule for timeframes derived from a finer interval
+RESAMPLE_RULES = MappingProxyType({
+    '4h': '4h',
+    '1wk': 'W-MON',  # weeks start on Monday like yfinance weekly bars
+    '1mo': 'MS'
+})
+
+# Single-ticker fetches in progress, shared by the sync and async fetchers
+_inflight = SingleFlight()
+
+
+def fetch_candles(ticker: str, timeframe: str = '1h', periods: int = 100) -> Optional[Candles]:
     """
     Fetches candle data for a ticker.
     
@@ -14,66 +49,208 @@ def fetch_candles(ticker: str, timeframe: str = '1h', periods: int = 100) -> Opt
         periods: Number of periods to fetch
         
     Returns:
-        List of candle dictionaries with keys: timestamp, open, high, low, close, volume
+        Candles with ts, open, high, low, close and volume arrays
         Returns None if data cannot be fetched
     """
-    try:
-        # Map timeframe to yfinance interval
-        interval_map = {
-            '5m': '5m',
-            '15m': '15m',
-            '1h': '1h',
-            '4h': '1h',  # yfinance doesn't have 4h, we'll aggregate 1h
-            '1d': '1d',
-            '1wk': '1wk',
-            '1mo': '1mo'
-        }
+    cached = candle_cache.get_candles(ticker, timeframe, periods, candle_cache.CHART)
+    if cached is not None:
+        return cached
+    
+    # Concurrent callers for the same candles share one request
+    return _inflight.do((ticker, timeframe, periods), _fetch_candles, ticker, timeframe, periods)
+
+
+def fetch_all_timeframes_bulk(tickers: List[str], timeframes: List[str]) -> Dict[Tuple[str, str], Candles]:
+    """
+    Fetches candle data for every ticker and timeframe in one batched request per base interval.
+    
+    Each timeframe is derived from its base interval (1h covers 4h, 1d covers
+    1wk and 1mo), and each base interval is downloaded for all tickers at once
+    with yf.download, so a full scan costs two requests instead of one per
+    ticker and timeframe.
+    
+    Args:
+        tickers: List of ticker symbols
+        timeframes: List of timeframes (e.g., ['4h', '1d', '1wk', '1mo'])
         
-        interval = interval_map.get(timeframe, '1h')
+    Returns:
+        Dictionary mapping (ticker, timeframe) to its Candles.
+        Pairs whose data cannot be fetched are omitted.
+    """
+    candles_by_key = {}
+    missing = defaultdict(lambda: defaultdict(list))
+    for ticker in tickers:
+        for timeframe in timeframes:
+            periods = config.LOOKBACK_PERIODS.get(timeframe, config.DEFAULT_LOOKBACK)
+            cached = candle_cache.get_candles(ticker, timeframe, periods, candle_cache.DOWNLOAD)
+            if cached is not None:
+                candles_by_key[(ticker, timeframe)] = cached
+            else:
+                missing[BASE_INTERVAL_MAP.get(timeframe, '1h')][ticker].append(timeframe)
+    
+    for base_interval, timeframes_by_ticker in missing.items():
+        # One request long enough for every timeframe derived from this base
+        base_timeframes = {tf for tfs in timeframes_by_ticker.values() for tf in tfs}
+        period = max((config.PERIOD_MAP.get(tf, '1mo') for tf in base_timeframes), key=PERIOD_ORDER.index)
         
-        # Determine period based on timeframe
-        period_map = {
-            '5m': '7d',
-            '15m': '1mo',
-            '1h': '2mo',
-            '4h': '6mo',
-            '1d': '1y',
-            '1wk': '2y',
-            '1mo': '5y'
-        }
+        frames = _download_frames(list(timeframes_by_ticker), period, base_interval)
+        for ticker, df in frames.items():
+            derived = _derive_timeframes(ticker, df, base_interval, timeframes_by_ticker[ticker])
+            for timeframe, candles in derived.items():
+                candles_by_key[(ticker, timeframe)] = candles
+    
+    return candles_by_key
+
+
+async def fetch_candles_async(ticker: str, timeframe: str, client: httpx.AsyncClient, periods: int = 100) -> Optional[Candles]:
+    """
+    Fetches candle data for a ticker from Yahoo's chart endpoint without blocking.
+    
+    Args:
+        ticker: Ticker symbol
+        timeframe: Timeframe (e.g., '5m', '15m', '1h', '4h', '1d', '1wk', '1mo')
+        client: Shared httpx.AsyncClient
+        periods: Number of periods to fetch
         
-        period = period_map.get(timeframe, '1mo')
+    Returns:
+        Candles with ts, open, high, low, close and volume arrays
+        Returns None if data cannot be fetched
+    """
+    cached = candle_cache.get_candles(ticker, timeframe, periods, candle_cache.CHART)
+    if cached is not None:
+        return cached
+    
+    return await _inflight.do_async((ticker, timeframe, periods), _fetch_candles_async, ticker, timeframe, client, periods)
+
+
+def _fetch_candles(ticker: str, timeframe: str, periods: int) -> Optional[Candles]:
+    """
+    Requests candles for fetch_candles once the cache and in-flight checks missed.
+    """
+    try:
+        interval = config.INTERVAL_MAP.get(timeframe, '1h')
+        period = config.PERIOD_MAP.get(timeframe, '1mo')
         
-        stock = yf.Ticker(ticker)
-        df = stock.history(period=period, interval=interval)
+        try:
+            # Timeframes are valid chart intervals, 4h is binned from 1h
+            candles = fetch_chart(get_session(), ticker, timeframe, period).tail(periods)
+        except KeyError:
+            # Unexpected payload, let yfinance handle it
+            stock = yf.Ticker(ticker, session=get_yfinance_session())
+            df = stock.history(period=period, interval=interval)
+            if df.empty:
+                return None
+            candles = _to_candles(df, timeframe, periods)
         
-        if df.empty:
+        if not len(candles):
             return None
         
-        # Handle 4h aggregation from 1h data
-        if timeframe == '4h':
-            df = df.resample('4h').agg({
-                'Open': 'first',
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last',
-                'Volume': 'sum'
-            }).dropna()
+        candle_cache.set_candles(ticker, timeframe, periods, candle_cache.CHART, candles)
+        return candles
+    
+    except Exception as e:
+        print(f"Error fetching data for {ticker} ({timeframe}): {e}")
+        return None
+
+
+async def _fetch_candles_async(ticker: str, timeframe: str, client: httpx.AsyncClient, periods: int) -> Optional[Candles]:
+    """
+    Requests candles for fetch_candles_async once the cache and in-flight checks missed.
+    """
+    try:
+        url, params = chart_request(ticker, timeframe, config.PERIOD_MAP.get(timeframe, '1mo'))
+        response = await client.get(url, params=params)
+        response.raise_for_status()
         
-        # Convert to list of dictionaries
-        candles = []
-        for idx, row in df.iterrows():
-            candles.append({
-                'timestamp': idx,
-                'open': row['Open'],
-                'high': row['High'],
-                'low': row['Low'],
-                'close': row['Close'],
-                'volume': row['Volume']
-            })
+        candles = parse_chart(response.content, timeframe).tail(periods)
+        if not len(candles):
+            return None
         
-        return candles[-periods:] if len(candles) > periods else candles
+        candle_cache.set_candles(ticker, timeframe, periods, candle_cache.CHART, candles)
+        return candles
     
     except Exception as e:
         print(f"Error fetching data for {ticker} ({timeframe}): {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def _download_frames(tickers: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+    """
+    Downloads one interval for several tickers with a single yf.download call.
+    
+    Returns:
+        Dictionary mapping each ticker to its OHLCV DataFrame.
+        Tickers without data are omitted.
+    """
+    try:
+        df = yf.download(
+            " ".join(tickers),
+            period=period,
+            interval=interval,
+            threads=True,
+            group_by='ticker',
+            progress=False,
+            auto_adjust=True,
+            # Keep each ticker's exchange-local wall clock so 4h bins line up
+            # with its trading day like they do with Ticker.history
+            ignore_tz=True,
+            session=get_yfinance_session()
+        )
+    except Exception as e:
+        print(f"Error fetching bulk data ({interval}): {e}")
+        return {}
+    
+    if df is None or df.empty:
+        return {}
+    
+    frames = {}
+    available = set(df.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        
+        # Tickers trade on different calendars, so drop the rows that
+        # only exist because of another ticker in the batch
+        ticker_df = df[ticker].dropna(subset=['Open', 'High', 'Low', 'Close'])
+        if not ticker_df.empty:
+            frames[ticker] = ticker_df
+    
+    return frames
+
+
+def _derive_timeframes(ticker: str, df: pd.DataFrame, base_interval: str, timeframes: List[str]) -> Dict[str, Candles]:
+    """
+    Builds and caches Candles for every timeframe derived from one base interval DataFrame.
+    """
+    candles_by_tf = {}
+    for timeframe in timeframes:
+        periods = config.LOOKBACK_PERIODS.get(timeframe, config.DEFAULT_LOOKBACK)
+        tf_df = _resample(df, RESAMPLE_RULES[timeframe]) if timeframe != base_interval else df
+        candles = Candles.from_frame(tf_df).tail(periods)
+        candle_cache.set_candles(ticker, timeframe, periods, candle_cache.DOWNLOAD, candles)
+        candles_by_tf[timeframe] = candles
+    return candles_by_tf
+
+
+def _to_candles(df: pd.DataFrame, timeframe: str, periods: int) -> Candles:
+    """
+    Converts an OHLCV DataFrame into Candles holding the last `periods` rows.
+    """
+    # Handle 4h aggregation from 1h data
+    if timeframe == '4h':
+        df = _resample(df, RESAMPLE_RULES['4h'])
+    
+    return Candles.from_frame(df).tail(periods)
+
+
+def _resample(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    Aggregates an OHLCV DataFrame into coarser candles labelled by their start.
+    """
+    return df.resample(rule, label='left', closed='left').agg({
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    }).dropna()
@@ -1,16 +1,28 @@
+import asyncio
 import streamlit as st
 import pandas as pd
+import httpx
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import config
-from monitor import check_ticker_timeframe
-import yfinance as yf
+from data_fetcher import fetch_candles_async
+from incremental import check_entry_criteria_incremental
+from yf_session import USER_AGENT
+from security_names import get_security_name, preload_security_names
 from streamlit_autorefresh import st_autorefresh
 
 
 st.set_page_config(page_title="Trading Monitor", layout="wide")
 
+
+@st.cache_resource
+def _preload_names():
+    # Runs once per server process, not on every rerun
+    preload_security_names(config.TICKERS)
+
+
+_preload_names()
+
 # Auto-refresh every CHECK_INTERVAL seconds
 st_autorefresh(interval=config.CHECK_INTERVAL * 1000, key="refresh")
 
@@ -21,35 +33,36 @@ st.sidebar.header("Settings")
 tickers = st.sidebar.multiselect("Select Tickers", config.TICKERS, default=config.TICKERS)
 timeframes = st.sidebar.multiselect("Select Timeframes", config.TIMEFRAMES, default=config.TIMEFRAMES)
 
-def get_security_name(ticker: str) -> str:
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        return info.get("longName") or info.get("shortName") or ticker
-    except Exception:
-        return ticker
-
-def run_scan(tickers, timeframes):
+async def _scan(tickers, timeframes):
     grouped_signals = defaultdict(list)
     errors = []
 
-    with ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(check_ticker_timeframe, ticker, timeframe): (ticker, timeframe)
-            for ticker in tickers for timeframe in timeframes
-        }
-        for future in as_completed(futures):
-            ticker, timeframe = futures[future]
-            try:
-                ticker, timeframe, signal, error = future.result()
-                if signal:
-                    grouped_signals[ticker].append((timeframe, signal))
-                elif error:
-                    errors.append((ticker, timeframe, error))
-            except Exception as e:
-                errors.append((ticker, timeframe, str(e)))
+    limits = httpx.Limits(max_connections=50, max_keepalive_connections=50)
+    async with httpx.AsyncClient(limits=limits, timeout=10, headers={"User-Agent": USER_AGENT}) as client:
+        keys = [(ticker, timeframe) for ticker in tickers for timeframe in timeframes]
+        results = await asyncio.gather(*[
+            fetch_candles_async(
+                ticker, timeframe, client,
+                config.LOOKBACK_PERIODS.get(timeframe, config.DEFAULT_LOOKBACK)
+            )
+            for ticker, timeframe in keys
+        ])
+
+    for (ticker, timeframe), candles in zip(keys, results):
+        if not candles:
+            errors.append((ticker, timeframe, "No data available"))
+            continue
+        try:
+            signal = check_entry_criteria_incremental(ticker, timeframe, candles)
+            if signal:
+                grouped_signals[ticker].append((timeframe, signal))
+        except Exception as e:
+            errors.append((ticker, timeframe, str(e)))
     return grouped_signals, errors
 
+def run_scan(tickers, timeframes):
+    return asyncio.run(_scan(tickers, timeframes))
+
 
 # Run scan automatically every refresh
 grouped_signals, errors = run_scan(tickers, timeframes)
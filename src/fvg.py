@@ -1,9 +1,16 @@
 """Module for identifying Fair Value Gaps (FVGs)."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+import numpy as np
+from numba import njit
+from candles import Candles
 
 
-def find_fvgs_in_range(candles: List[Dict], start_idx: int, end_idx: int, fvg_type: str) -> List[Dict]:
+# FVG dictionary: type, top, bottom, start_idx, end_idx
+FVG = Dict[str, Union[str, float, int]]
+
+
+def find_fvgs_in_range(candles: Candles, start_idx: int, end_idx: int, fvg_type: str) -> List[FVG]:
     """
     Find all FVGs of a specific type in a given range.
     
@@ -12,7 +19,7 @@ def find_fvgs_in_range(candles: List[Dict], start_idx: int, end_idx: int, fvg_ty
     - Bearish FVG: first candle's low > third candle's high (must be a real gap)
     
     Args:
-        candles: List of candle dictionaries
+        candles: Candles
         start_idx: Starting index of the range (inclusive)
         end_idx: Ending index of the range (inclusive)
         fvg_type: 'bullish' or 'bearish'
@@ -25,68 +32,122 @@ def find_fvgs_in_range(candles: List[Dict], start_idx: int, end_idx: int, fvg_ty
         - start_idx: index of first candle in the 3-candle pattern
         - end_idx: index of third candle in the 3-candle pattern
     """
+    if fvg_type not in ('bullish', 'bearish'):
+        return []
+    
+    highs, lows = candles.high, candles.low
+    starts = _find_fvg_mask(highs, lows, start_idx, end_idx, fvg_type == 'bullish')
+    
+    # Dictionaries are only built for the gaps found, not per candle
     fvgs = []
+    for i in starts.tolist():
+        if fvg_type == 'bullish':
+            # Bullish FVG: gap between first high and third low
+            top, bottom = lows[i + 2], highs[i]
+        else:
+            # Bearish FVG: gap between third high and first low
+            top, bottom = lows[i], highs[i + 2]
+        fvgs.append({
+            'type': fvg_type,
+            'top': float(top),
+            'bottom': float(bottom),
+            'start_idx': i,
+            'end_idx': i + 2
+        })
+    return fvgs
+
+
+def _find_fvg_mask(highs: np.ndarray, lows: np.ndarray, start_idx: int, end_idx: int, is_bullish: bool) -> np.ndarray:
+    """
+    Vectorized scan behind find_fvgs_in_range.
     
+    Compares each first candle with the third one through shifted slices
+    instead of a Python loop.
+    
+    Returns:
+        Start indices of the FVGs in the range, in ascending order
+    """
     # Ensure we don't go out of bounds
-    search_end = min(end_idx, len(candles) - 3)
+    start_idx = max(start_idx, 0)
+    search_end = min(end_idx, len(highs) - 3)
+    if search_end < start_idx:
+        return np.empty(0, dtype=np.int64)
     
-    for i in range(start_idx, search_end + 1):
-        if i + 2 >= len(candles):
-            break
+    first = slice(start_idx, search_end + 1)
+    third = slice(start_idx + 2, search_end + 3)
+    if is_bullish:
+        mask = lows[third] > highs[first]
+    else:
+        mask = highs[third] < lows[first]
+    return np.flatnonzero(mask) + start_idx
 
-        if fvg_type == 'bullish':
-            first_high = candles[i]['high']
-            third_low = candles[i + 2]['low']
-            
-            # Bullish FVG: gap between first high and third low
-            if third_low > first_high:  # must be a real gap
-                fvg = {
-                    'type': 'bullish',
-                    'top': third_low,
-                    'bottom': first_high,
-                    'start_idx': i,
-                    'end_idx': i + 2
-                }
-                if fvg['top'] > fvg['bottom']:  # safeguard
-                    fvgs.append(fvg)
 
-        elif fvg_type == 'bearish':
-            first_low = candles[i]['low']
-            third_high = candles[i + 2]['high']
-            
-            # Bearish FVG: gap between third high and first low
-            if first_low > third_high:  # must be a real gap
-                fvg = {
-                    'type': 'bearish',
-                    'top': first_low,
-                    'bottom': third_high,
-                    'start_idx': i,
-                    'end_idx': i + 2
-                }
-                if fvg['top'] > fvg['bottom']:  # safeguard
-                    fvgs.append(fvg)
+@njit(cache=True)
+def _find_optimal_fvg(highs: np.ndarray, lows: np.ndarray, start_idx: int, end_idx: int, is_bullish: bool) -> Tuple[bool, float, float, int, int]:
+    """
+    Compiled single pass behind find_optimal_fvg.
     
-    return fvgs
+    Returns:
+        Tuple (found, top, bottom, start_idx, end_idx) of the optimal FVG
+    """
+    # Ensure we don't go out of bounds
+    search_end = min(end_idx, len(highs) - 3)
+    
+    best = -1
+    top = 0.0
+    bottom = 0.0
+    
+    for i in range(start_idx, search_end + 1):
+        if is_bullish:
+            # Gap between first high and third low, topmost wins
+            if lows[i + 2] > highs[i] and (best < 0 or highs[i] > bottom):
+                best = i
+                top = lows[i + 2]
+                bottom = highs[i]
+        else:
+            # Gap between third high and first low, bottommost wins
+            if lows[i] > highs[i + 2] and (best < 0 or lows[i] < top):
+                best = i
+                top = lows[i]
+                bottom = highs[i + 2]
+    
+    return best >= 0, top, bottom, best, best + 2
 
 
-def select_optimal_fvg(fvgs: List[Dict], fvg_type: str) -> Optional[Dict]:
+def find_optimal_fvg(candles: Candles, start_idx: int, end_idx: int, fvg_type: str) -> Optional[FVG]:
     """
-    Select the optimal FVG from a list of FVGs.
+    Find the optimal FVG of a specific type in a given range in a single pass.
     
     For bullish FVGs: selects the TOPMOST (highest bottom value)
     For bearish FVGs: selects the BOTTOMMOST (lowest top value)
     
+    Only the best gap seen so far is tracked, so no FVG dictionaries are built
+    for the gaps that lose; the first of several equal gaps wins.
+    
     Args:
-        fvgs: List of FVG dictionaries
+        candles: Candles
+        start_idx: Starting index of the range (inclusive)
+        end_idx: Ending index of the range (inclusive)
         fvg_type: 'bullish' or 'bearish'
         
     Returns:
-        The optimal FVG dictionary, or None if list is empty
+        The optimal FVG dictionary (same keys as find_fvgs_in_range entries),
+        or None if no FVG exists in the range
     """
-    if not fvgs:
+    if fvg_type not in ('bullish', 'bearish'):
         return None
     
-    if fvg_type == 'bullish':
-        return max(fvgs, key=lambda x: x['bottom'])
-    else:
-        return min(fvgs, key=lambda x: x['top'])
+    # Same range handling as find_fvgs_in_range
+    found, top, bottom, fvg_start, fvg_end = _find_optimal_fvg(
+        candles.high, candles.low, max(start_idx, 0), end_idx, fvg_type == 'bullish'
+    )
+    
+    if not found:
+        return None
+    return {
+        'type': fvg_type,
+        'top': top,
+        'bottom': bottom,
+        'start_idx': fvg_start,
+        'end_idx': fvg_end
+    }
@@ -0,0 +1,180 @@
+"""Incremental strategy evaluation across scan cycles."""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+from candles import Candles
+from swing_point import SwingArrays, find_swing_point_arrays
+from strategy import Signal, evaluate_swing_points
+
+
+@dataclass
+class StrategyState:
+    """
+    What the last evaluation of one ticker and timeframe saw and produced.
+
+    Attributes:
+        length: Number of candles evaluated
+        last_ts: Timestamp of the newest candle
+        last_high: High of the newest candle
+        last_low: Low of the newest candle
+        last_close: Close of the newest candle
+        prev_high: High of the second newest candle
+        prev_low: Low of the second newest candle
+        sp_indices: Indices of the 3 swing points, most recent first, or None
+        sp_types: Type codes of the 3 swing points, or None
+        sp_values: High/low values of the 3 swing points, or None
+        signal: Entry signal returned for these candles, or None
+    """
+    length: int
+    last_ts: np.datetime64
+    last_high: float
+    last_low: float
+    last_close: float
+    prev_high: float
+    prev_low: float
+    sp_indices: Optional[np.ndarray]
+    sp_types: Optional[np.ndarray]
+    sp_values: Optional[np.ndarray]
+    signal: Optional[Signal]
+
+    def is_current(self, candles: Candles) -> bool:
+        """
+        Checks whether `candles` are the ones this state was built from.
+
+        Only the newest candle can still change between fetches, so comparing
+        it (plus the length) is enough to reuse the stored signal.
+
+        Args:
+            candles: Candles of the same ticker and timeframe
+
+        Returns:
+            True if the stored signal is valid for `candles`
+        """
+        n = len(candles)
+        return (
+            n == self.length and n > 0
+            and candles.ts[-1] == self.last_ts
+            and candles.high[-1] == self.last_high
+            and candles.low[-1] == self.last_low
+            and candles.close[-1] == self.last_close
+        )
+
+
+# States of the in-process scans, keyed by (ticker, timeframe)
+_states: Dict[Tuple[str, str], StrategyState] = {}
+
+
+def get_state(ticker: str, timeframe: str) -> Optional[StrategyState]:
+    """
+    Returns the stored state of a ticker and timeframe, if any.
+    """
+    return _states.get((ticker, timeframe))
+
+
+def save_state(ticker: str, timeframe: str, state: StrategyState) -> None:
+    """
+    Stores the state of a ticker and timeframe for the next scan.
+    """
+    _states[(ticker, timeframe)] = state
+
+
+def advance_state(candles: Candles, state: Optional[StrategyState] = None) -> StrategyState:
+    """
+    Evaluates the entry criteria for `candles`, reusing the previous state where possible.
+
+    Returns the stored state untouched when the newest candle is unchanged.
+    Otherwise only the bars that arrived or changed since the previous scan go
+    through the swing detector. The result is merged with the stored swing
+    points, and a full scan is the fallback whenever that merge is not safe.
+    The trend and FVG steps only look at the bars after the 2nd swing point,
+    so they are rerun on the result.
+
+    Args:
+        candles: Candles (oldest to newest)
+        state: State from the previous scan of the same ticker and timeframe
+
+    Returns:
+        New state whose `signal` matches check_entry_criteria(candles)
+    """
+    if state is not None and state.is_current(candles):
+        return state
+
+    swing_arrays = None
+    if state is not None and state.sp_indices is not None:
+        swing_arrays = _advance_swing_points(candles, state)
+    if swing_arrays is None:
+        swing_arrays = find_swing_point_arrays(candles)
+
+    signal = evaluate_swing_points(candles, *swing_arrays) if swing_arrays is not None else None
+    sp_indices, sp_types, sp_values = swing_arrays if swing_arrays is not None else (None, None, None)
+
+    n = len(candles)
+    return StrategyState(
+        length=n,
+        last_ts=candles.ts[-1] if n else None,
+        last_high=float(candles.high[-1]) if n else np.nan,
+        last_low=float(candles.low[-1]) if n else np.nan,
+        last_close=float(candles.close[-1]) if n else np.nan,
+        prev_high=float(candles.high[-2]) if n > 1 else np.nan,
+        prev_low=float(candles.low[-2]) if n > 1 else np.nan,
+        sp_indices=sp_indices,
+        sp_types=sp_types,
+        sp_values=sp_values,
+        signal=signal
+    )
+
+
+def check_entry_criteria_incremental(ticker: str, timeframe: str, candles: Candles) -> Optional[Signal]:
+    """
+    check_entry_criteria backed by the in-process state of the ticker and timeframe.
+
+    Args:
+        ticker: Ticker symbol
+        timeframe: Timeframe of `candles`
+        candles: Candles (oldest to newest)
+
+    Returns:
+        Entry signal dictionary as returned by check_entry_criteria, or None
+    """
+    state = advance_state(candles, get_state(ticker, timeframe))
+    save_state(ticker, timeframe, state)
+    return state.signal
+
+
+def _advance_swing_points(candles: Candles, state: StrategyState) -> Optional[SwingArrays]:
+    """
+    Finds the 3 swing points of `candles` by scanning only the bars newer than the stored ones.
+
+    Returns:
+        Tuple (indices, types, values) like find_swing_point_arrays, or None
+        if the stored swing points cannot be reused and a full scan is needed
+    """
+    # Locate the previously newest candle; the window may have slid forward
+    j = int(np.searchsorted(candles.ts, state.last_ts))
+    if j < 1 or j >= len(candles) or candles.ts[j] != state.last_ts:
+        return None
+
+    # Bars before the previously newest one must be the ones already scanned
+    if candles.high[j - 1] != state.prev_high or candles.low[j - 1] != state.prev_low:
+        return None
+
+    # The previously second newest candle is the first whose swing status can
+    # change, so stored swing points must be older and still in the window
+    rescan_from = j - 1
+    old_indices = state.sp_indices - (state.length - 1 - j)
+    if old_indices[0] >= rescan_from or old_indices[2] < 1:
+        return None
+
+    count, indices, types, values = find_swing_point_arrays(candles, stop=rescan_from - 1, partial=True)
+    if count == 3:
+        return indices, types, values
+
+    # Continue the alternation into the stored points: the newest stored one
+    # is skipped if it has the same type as the oldest new one
+    skip = 1 if count and types[count - 1] == state.sp_types[0] else 0
+    take = 3 - count
+    indices[count:] = old_indices[skip:skip + take]
+    types[count:] = state.sp_types[skip:skip + take]
+    values[count:] = state.sp_values[skip:skip + take]
+    return indices, types, values
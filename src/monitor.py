@@ -1,36 +1,28 @@
 """Main monitoring script for multiple timeframes with grouped alerts."""
 
+import io
+import os
+import sys
 import time
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from collections import defaultdict
 from typing import Dict, List, Tuple, Optional
 import config
-from data_fetcher import fetch_candles
-from strategy import check_entry_criteria
-import yfinance as yf
+from data_fetcher import fetch_all_timeframes_bulk
+from strategy import Signal
+from incremental import StrategyState, advance_state, get_state, save_state
+from security_names import get_security_name, preload_security_names
+from candles import Candles
 
 
-# Cache for security names to avoid repeated API calls
-_security_name_cache = {}
+# Kept alive across scans so processes are not recreated every cycle. Created
+# on first use, so workers re-importing this module do not start their own
+_CPU_POOL = None
 
 
-def get_security_name(ticker: str) -> str:
-    if ticker in _security_name_cache:
-        return _security_name_cache[ticker]
-    
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        name = info.get('longName') or info.get('shortName') or ticker
-        _security_name_cache[ticker] = name
-        return name
-    except Exception:
-        _security_name_cache[ticker] = ticker
-        return ticker
-
-
-def format_signal(ticker: str, timeframe: str, signal: Dict) -> str:
+def format_signal(ticker: str, timeframe: str, signal: Signal) -> str:
     trend = signal['trend'].upper()
     sp1_idx, sp1_type, sp1_value = signal['swing_points'][0]
     sp2_idx, sp2_type, sp2_value = signal['swing_points'][1]
@@ -38,17 +30,7 @@ def format_signal(ticker: str, timeframe: str, signal: Dict) -> str:
     
     fvg = signal['fvg']
     
-    tf_names = {
-        '5m': '5 Minutes',
-        '15m': '15 Minutes',
-        '1h': '1 Hour',
-        '4h': '4 Hours',
-        '1d': 'Daily',
-        '1wk': 'Weekly',
-        '1mo': 'Monthly'
-    }
-    
-    output = f"  📊 Timeframe: {tf_names.get(timeframe, timeframe)}\n"
+    output = f"  📊 Timeframe: {config.TF_NAMES.get(timeframe, timeframe)}\n"
     output += f"  Trend: {trend}\n"
     output += f"  Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
     
@@ -75,20 +57,10 @@ def format_signal(ticker: str, timeframe: str, signal: Dict) -> str:
     return output
 
 
-def format_grouped_signals(grouped_signals: Dict[str, List[Tuple[str, Dict]]]) -> str:
+def format_grouped_signals(grouped_signals: Dict[str, List[Tuple[str, Signal]]]) -> str:
     if not grouped_signals:
         return ""
     
-    timeframe_priority = {
-        '1mo': 0,
-        '1wk': 1,
-        '1d': 2,
-        '4h': 3,
-        '1h': 4,
-        '15m': 5,
-        '5m': 6
-    }
-    
     output = f"\n{'='*70}\n"
     output += f"🎯 ENTRY SIGNALS DETECTED\n"
     output += f"{'='*70}\n\n"
@@ -100,7 +72,7 @@ def format_grouped_signals(grouped_signals: Dict[str, List[Tuple[str, Dict]]]) -
         security_name = get_security_name(ticker)
         
         signals = sorted(grouped_signals[ticker], 
-                        key=lambda x: timeframe_priority.get(x[0], 999))
+                        key=lambda x: config.TIMEFRAME_PRIORITY.get(x[0], 999))
         
         if security_name != ticker:
             header_text = f"{ticker} - {security_name}"
@@ -126,19 +98,80 @@ def format_grouped_signals(grouped_signals: Dict[str, List[Tuple[str, Dict]]]) -
     return output
 
 
-def check_ticker_timeframe(ticker: str, timeframe: str) -> Tuple[str, str, Optional[Dict], Optional[str]]:
+def analyze_candles(candles: Candles, state: Optional[StrategyState]) -> Tuple[Optional[StrategyState], Optional[str]]:
     try:
-        periods = config.LOOKBACK_PERIODS.get(timeframe, config.DEFAULT_LOOKBACK)
-        candles = fetch_candles(ticker, timeframe, periods)
-        
-        if not candles:
-            return (ticker, timeframe, None, "No data available")
-        
-        signal = check_entry_criteria(candles)
-        return (ticker, timeframe, signal, None)
+        return advance_state(candles, state), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    global _CPU_POOL
+    if _CPU_POOL is None:
+        _CPU_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _CPU_POOL
+
+
+def _restart_cpu_pool() -> None:
+    global _CPU_POOL
+    _CPU_POOL.shutdown(wait=False, cancel_futures=True)
+    _CPU_POOL = None
+
+
+def scan_tickers(tickers: List[str], timeframes: List[str]) -> Tuple[Dict[str, List[Tuple[str, Signal]]], List[Tuple[str, str, str]]]:
+    grouped_signals = defaultdict(list)
+    errors = []
+    
+    # Two batched downloads cover every ticker, so no network I/O is left
+    # for the workers
+    try:
+        candles_by_key = fetch_all_timeframes_bulk(tickers, timeframes)
+    except Exception as e:
+        errors.extend((ticker, timeframe, f"Fetch failed: {e}") for ticker in tickers for timeframe in timeframes)
+        return grouped_signals, errors
+    
+    keys = []
+    candles_list = []
+    states = []
+    for ticker in tickers:
+        for timeframe in timeframes:
+            candles = candles_by_key.get((ticker, timeframe))
+            if not candles:
+                errors.append((ticker, timeframe, "No data available"))
+                continue
+            
+            # Unchanged since the last scan, reuse the signal without a worker
+            state = get_state(ticker, timeframe)
+            if state is not None and state.is_current(candles):
+                if state.signal:
+                    grouped_signals[ticker].append((timeframe, state.signal))
+                continue
+            
+            keys.append((ticker, timeframe))
+            candles_list.append(candles)
+            states.append(state)
     
+    # Analysis runs on processes, batched to cut per-task overhead. Workers get
+    # the previous state so they only rescan the new bars
+    try:
+        results = list(_get_cpu_pool().map(analyze_candles, candles_list, states, chunksize=8))
     except Exception as e:
-        return (ticker, timeframe, None, str(e))
+        # A dead worker breaks the pool for good, start a new one for the next scan
+        if isinstance(e, BrokenProcessPool):
+            _restart_cpu_pool()
+        errors.extend((ticker, timeframe, f"Analysis failed: {e}") for ticker, timeframe in keys)
+        return grouped_signals, errors
+    
+    for (ticker, timeframe), (state, error) in zip(keys, results):
+        if error:
+            errors.append((ticker, timeframe, error))
+            continue
+        
+        save_state(ticker, timeframe, state)
+        if state.signal:
+            grouped_signals[ticker].append((timeframe, state.signal))
+    
+    return grouped_signals, errors
 
 
 def monitor_tickers():
@@ -150,51 +183,36 @@ def monitor_tickers():
     print(f"Check interval: {config.CHECK_INTERVAL} seconds")
     print(f"\nPress Ctrl+C to stop\n")
     
+    preload_security_names(config.TICKERS)
+    
     try:
         while True:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             print(f"\n[{timestamp}] Checking all tickers across all timeframes...")
             print(f"{'-'*70}")
             
-            grouped_signals = defaultdict(list)
-            errors = []
-            checks_completed = 0
             total_checks = len(config.TICKERS) * len(config.TIMEFRAMES)
+            grouped_signals, errors = scan_tickers(config.TICKERS, config.TIMEFRAMES)
             
-            with ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
-                futures = {}
-                for ticker in config.TICKERS:
-                    for timeframe in config.TIMEFRAMES:
-                        future = executor.submit(check_ticker_timeframe, ticker, timeframe)
-                        futures[future] = (ticker, timeframe)
-                
-                for future in as_completed(futures):
-                    try:
-                        ticker, timeframe, signal, error = future.result()
-                        checks_completed += 1
-                        
-                        if signal:
-                            grouped_signals[ticker].append((timeframe, signal))
-                        elif error:
-                            errors.append((ticker, timeframe, error))
-                    except Exception as e:
-                        checks_completed += 1
-                        ticker, timeframe = futures[future]
-                        errors.append((ticker, timeframe, f"Task failed: {str(e)}"))
+            # Build the whole report first and write it in one go
+            report = io.StringIO()
             
             if grouped_signals:
-                print(format_grouped_signals(grouped_signals))
+                print(format_grouped_signals(grouped_signals), file=report)
             
             if errors:
-                print(f"\n⚠️  Errors encountered:")
+                print(f"\n⚠️  Errors encountered:", file=report)
                 for ticker, timeframe, error in errors:
-                    print(f"  {ticker} [{timeframe}]: {error}")
+                    print(f"  {ticker} [{timeframe}]: {error}", file=report)
+            
+            print(f"\n{'-'*70}", file=report)
+            print(f"Scan complete: {total_checks}/{total_checks} checks", file=report)
+            print(f"Tickers with signals: {len(grouped_signals)}", file=report)
+            print(f"Total signals found: {sum(len(signals) for signals in grouped_signals.values())}", file=report)
+            print(f"Next check in {config.CHECK_INTERVAL} seconds...", file=report)
             
-            print(f"\n{'-'*70}")
-            print(f"Scan complete: {checks_completed}/{total_checks} checks")
-            print(f"Tickers with signals: {len(grouped_signals)}")
-            print(f"Total signals found: {sum(len(signals) for signals in grouped_signals.values())}")
-            print(f"Next check in {config.CHECK_INTERVAL} seconds...")
+            sys.stdout.write(report.getvalue())
+            sys.stdout.flush()
             
             time.sleep(config.CHECK_INTERVAL)
     
@@ -209,41 +227,28 @@ def test_single_scan():
     print(f"Running Single Scan Test (Grouped by Ticker)")
     print(f"{'='*70}\n")
     
-    grouped_signals = defaultdict(list)
-    errors = []
+    preload_security_names(config.TICKERS)
+    grouped_signals, errors = scan_tickers(config.TICKERS, config.TIMEFRAMES)
     
-    with ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
-        futures = {}
-        for ticker in config.TICKERS:
-            for timeframe in config.TIMEFRAMES:
-                future = executor.submit(check_ticker_timeframe, ticker, timeframe)
-                futures[future] = (ticker, timeframe)
-        
-        for future in as_completed(futures):
-            try:
-                ticker, timeframe, signal, error = future.result()
-                
-                if signal:
-                    grouped_signals[ticker].append((timeframe, signal))
-                elif error:
-                    errors.append((ticker, timeframe, error))
-            except Exception as e:
-                ticker, timeframe = futures[future]
-                errors.append((ticker, timeframe, f"Task failed: {str(e)}"))
+    # Build the whole report first and write it in one go
+    report = io.StringIO()
     
     if grouped_signals:
-        print(format_grouped_signals(grouped_signals))
+        print(format_grouped_signals(grouped_signals), file=report)
     
     if errors:
-        print(f"\n⚠️  Errors encountered:")
+        print(f"\n⚠️  Errors encountered:", file=report)
         for ticker, timeframe, error in errors:
-            print(f"  {ticker} [{timeframe}]: {error}")
+            print(f"  {ticker} [{timeframe}]: {error}", file=report)
     
-    print(f"\n{'='*70}")
-    print(f"Test complete.")
-    print(f"Tickers with signals: {len(grouped_signals)}")
-    print(f"Total signals found: {sum(len(signals) for signals in grouped_signals.values())}")
-    print(f"{'='*70}")
+    print(f"\n{'='*70}", file=report)
+    print(f"Test complete.", file=report)
+    print(f"Tickers with signals: {len(grouped_signals)}", file=report)
+    print(f"Total signals found: {sum(len(signals) for signals in grouped_signals.values())}", file=report)
+    print(f"{'='*70}", file=report)
+    
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+"""Cached lookup of human-readable security names."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from diskcache import Cache
+import yfinance as yf
+import config
+from yf_session import get_yfinance_session
+from singleflight import SingleFlight
+
+
+# Directory holding the names, survives restarts of the monitor
+CACHE_DIR = '.name_cache'
+
+_disk_cache = Cache(CACHE_DIR)
+
+# In-process layer in front of the disk cache: ticker -> (name, expires_at)
+_memory_cache = {}
+_memory_lock = threading.Lock()
+
+# Lookups in progress, keyed by ticker
+_inflight = SingleFlight()
+
+
+def _fetch_security_name(ticker: str) -> Optional[str]:
+    try:
+        stock = yf.Ticker(ticker, session=get_yfinance_session())
+        info = stock.info
+        return info.get('longName') or info.get('shortName')
+    except Exception:
+        return None
+
+
+def get_security_name(ticker: str) -> str:
+    """
+    Returns the long name of a security, falling back to the ticker itself.
+
+    Names are cached in memory and on disk for SECURITY_NAME_CACHE_DURATION
+    seconds, so `Ticker.info` is only requested once per ticker per day. A
+    failed lookup falls back to the ticker in memory only, and is retried
+    after SECURITY_NAME_RETRY_DURATION seconds.
+
+    Args:
+        ticker: Ticker symbol
+
+    Returns:
+        Security name, or the ticker if no name is available
+    """
+    now = time.time()
+    with _memory_lock:
+        entry = _memory_cache.get(ticker)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+    # Concurrent lookups of the same ticker share one disk read and request
+    return _inflight.do(ticker, _load_security_name, ticker)
+
+
+def _load_security_name(ticker: str) -> str:
+    name, expires_at = _disk_cache.get(ticker, expire_time=True)
+    if name is None:
+        name = _fetch_security_name(ticker)
+        if name is not None:
+            _disk_cache.set(ticker, name, expire=config.SECURITY_NAME_CACHE_DURATION)
+            expires_at = time.time() + config.SECURITY_NAME_CACHE_DURATION
+        else:
+            # Keep the fallback out of the disk cache so an outage is not
+            # remembered across restarts
+            name = ticker
+            expires_at = time.time() + config.SECURITY_NAME_RETRY_DURATION
+
+    with _memory_lock:
+        _memory_cache[ticker] = (name, expires_at)
+    return name
+
+
+def preload_security_names(tickers: List[str]) -> None:
+    """
+    Warms the name cache for the given tickers in the background.
+
+    Args:
+        tickers: List of ticker symbols
+    """
+    executor = ThreadPoolExecutor(max_workers=config.MAX_WORKERS)
+    executor.map(get_security_name, tickers)
+    executor.shutdown(wait=False)
@@ -0,0 +1,88 @@
+"""Deduplication of concurrent calls doing the same work."""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers share its result.
+
+    Works across threads and event loops: waiters block on (or await) the
+    Future of the call already in flight instead of repeating it. Results are
+    not kept once the call finishes, caching is left to the caller.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Calls fn(*args) unless a call for `key` is in flight, then waits for that one.
+
+        Args:
+            key: Identifies the work, e.g. (ticker, timeframe, periods)
+            fn: Function doing the work
+            *args: Arguments for fn
+
+        Returns:
+            The result of the call for `key`
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Awaits fn(*args) unless a call for `key` is in flight, then awaits that one.
+
+        Shares the in-flight map with do(), so sync and async callers of the
+        same key are deduplicated against each other.
+
+        Args:
+            key: Identifies the work, e.g. (ticker, timeframe, periods)
+            fn: Coroutine function doing the work
+            *args: Arguments for fn
+
+        Returns:
+            The result of the call for `key`
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await fn(*args)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
@@ -1,53 +1,49 @@
 """Core trading strategy logic."""
 
-from typing import List, Dict, Optional
-from swing_point import find_three_swing_points
-from fvg import find_fvgs_in_range, select_optimal_fvg
+from typing import Dict, List, Optional, Union
+import numpy as np
+from numba import njit
+from candles import Candles
+from swing_point import SWING_HIGH, SWING_LOW, SwingPoint, find_swing_point_arrays, swing_points_to_tuples
+from fvg import FVG, find_optimal_fvg
 
 
-def check_candles_close_above(candles: List[Dict], start_idx: int, end_idx: int, threshold: float) -> bool:
-    """
-    Check if any candle closes above threshold between indices.
-    
-    Args:
-        candles: List of candle dictionaries
-        start_idx: Starting index (inclusive)
-        end_idx: Ending index (inclusive)
-        threshold: Price threshold to check against
-        
-    Returns:
-        True if any candle closes above threshold, False otherwise
-    """
-    for i in range(start_idx, end_idx + 1):
-        if i >= len(candles):
-            break
-        if candles[i]['close'] > threshold:
-            return True
-    return False
+# Swing pattern codes, computed as (1st swing type << 1) | 3rd swing type
+PATTERN_SH_SH = (SWING_HIGH << 1) | SWING_HIGH
+PATTERN_SL_SL = (SWING_LOW << 1) | SWING_LOW
+
+# Breakout directions for _check_breakout
+BREAKOUT_ABOVE = 1
+BREAKOUT_BELOW = -1
+
+# Entry signal dictionary: trend, swing_points, fvg, target, stop_loss
+Signal = Dict[str, Union[str, List[SwingPoint], FVG, float]]
 
 
-def check_candles_close_below(candles: List[Dict], start_idx: int, end_idx: int, threshold: float) -> bool:
+@njit(cache=True)
+def _check_breakout(closes: np.ndarray, start_idx: int, threshold: float, direction: int) -> bool:
     """
-    Check if any candle closes below threshold between indices.
+    Check if any candle from start_idx to the last one closes beyond threshold.
     
     Args:
-        candles: List of candle dictionaries
+        closes: Array of close prices
         start_idx: Starting index (inclusive)
-        end_idx: Ending index (inclusive)
         threshold: Price threshold to check against
+        direction: BREAKOUT_ABOVE or BREAKOUT_BELOW
         
     Returns:
-        True if any candle closes below threshold, False otherwise
+        True if any candle closes above (or below) threshold, False otherwise
     """
-    for i in range(start_idx, end_idx + 1):
-        if i >= len(candles):
-            break
-        if candles[i]['close'] < threshold:
+    for i in range(start_idx, len(closes)):
+        if direction == BREAKOUT_ABOVE:
+            if closes[i] > threshold:
+                return True
+        elif closes[i] < threshold:
             return True
     return False
 
 
-def analyze_trend(candles: List[Dict], swing_points: List[tuple]) -> Optional[str]:
+def analyze_trend(candles: Candles, sp_indices: np.ndarray, sp_types: np.ndarray, sp_values: np.ndarray) -> Optional[str]:
     """
     Analyzes trend based on 3 swing points.
     
@@ -55,46 +51,47 @@ def analyze_trend(candles: List[Dict], swing_points: List[tuple]) -> Optional[st
     swing point is higher/lower than the oldest, we consider it a valid trend.
     
     Args:
-        candles: List of candle dictionaries
-        swing_points: List of 3 swing points [(idx, type, value), ...]
+        candles: Candles
+        sp_indices: Indices of the 3 swing points, most recent first
+        sp_types: Type codes (SWING_HIGH / SWING_LOW) of the 3 swing points
+        sp_values: High/low values of the 3 swing points
         
     Returns:
         'bullish', 'bearish', or None
     """
-    sp1_idx, sp1_type, sp1_value = swing_points[0]  # Most recent
-    sp2_idx, sp2_type, sp2_value = swing_points[1]  # Middle
-    sp3_idx, sp3_type, sp3_value = swing_points[2]  # Oldest (3rd)
+    closes = candles.close
+    pattern = (int(sp_types[0]) << 1) | int(sp_types[2])
     
     # Case 1: SH -> SL -> SH pattern (bullish potential)
-    if sp3_type == 'SH' and sp1_type == 'SH':
+    if pattern == PATTERN_SH_SH:
         # Primary check: Has price broken above the oldest swing high?
-        if check_candles_close_above(candles, sp3_idx, len(candles) - 1, sp3_value):
+        if _check_breakout(closes, sp_indices[2], sp_values[2], BREAKOUT_ABOVE):
             return 'bullish'
         # Secondary check: Is the most recent SH higher than the oldest SH?
         # This indicates bullish structure even without a full breakout yet
-        elif sp1_value > sp3_value:
+        elif sp_values[0] > sp_values[2]:
             return 'bullish'
         # Check if price has moved below middle swing low, indicating bearish break
-        elif check_candles_close_below(candles, sp2_idx, len(candles) - 1, sp2_value):
+        elif _check_breakout(closes, sp_indices[1], sp_values[1], BREAKOUT_BELOW):
             return 'bearish'
     
     # Case 2: SL -> SH -> SL pattern (bearish potential)
-    elif sp3_type == 'SL' and sp1_type == 'SL':
+    elif pattern == PATTERN_SL_SL:
         # Primary check: Has price broken below the oldest swing low?
-        if check_candles_close_below(candles, sp3_idx, len(candles) - 1, sp3_value):
+        if _check_breakout(closes, sp_indices[2], sp_values[2], BREAKOUT_BELOW):
             return 'bearish'
         # Secondary check: Is the most recent SL lower than the oldest SL?
         # This indicates bearish structure even without a full breakdown yet
-        elif sp1_value < sp3_value:
+        elif sp_values[0] < sp_values[2]:
             return 'bearish'
         # Check if price has moved above middle swing high, indicating bullish break
-        elif check_candles_close_above(candles, sp2_idx, len(candles) - 1, sp2_value):
+        elif _check_breakout(closes, sp_indices[1], sp_values[1], BREAKOUT_ABOVE):
             return 'bullish'
     
     return None
 
 
-def check_entry_criteria(candles: List[Dict]) -> Optional[Dict]:
+def check_entry_criteria(candles: Candles) -> Optional[Signal]:
     """
     Main function to check if entry criteria are met according to the technical specification.
     
@@ -102,7 +99,7 @@ def check_entry_criteria(candles: List[Dict]) -> Optional[Dict]:
     "If a Bullish Fair Value Gap exists between the 1st and 2nd Swing Points"
     
     Args:
-        candles: List of candle dictionaries
+        candles: Candles
         
     Returns:
         Dictionary containing entry signal info with keys:
@@ -114,51 +111,57 @@ def check_entry_criteria(candles: List[Dict]) -> Optional[Dict]:
         Returns None if no valid entry signal is found
     """
     # Step 1: Find 3 swing points
-    swing_points = find_three_swing_points(candles)
-    if not swing_points:
+    swing_arrays = find_swing_point_arrays(candles)
+    if swing_arrays is None:
         return None
     
+    return evaluate_swing_points(candles, *swing_arrays)
+
+
+def evaluate_swing_points(candles: Candles, sp_indices: np.ndarray, sp_types: np.ndarray, sp_values: np.ndarray) -> Optional[Signal]:
+    """
+    Runs the trend and FVG steps of check_entry_criteria on already found swing points.
+    
+    Args:
+        candles: Candles
+        sp_indices: Indices of the 3 swing points, most recent first
+        sp_types: Type codes (SWING_HIGH / SWING_LOW) of the 3 swing points
+        sp_values: High/low values of the 3 swing points
+        
+    Returns:
+        Entry signal dictionary as returned by check_entry_criteria, or None
+    """
     # Step 2: Analyze trend
-    trend = analyze_trend(candles, swing_points)
+    trend = analyze_trend(candles, sp_indices, sp_types, sp_values)
     if not trend:
         return None
     
-    sp1_idx, sp1_type, sp1_value = swing_points[0]  # Most recent
-    sp2_idx, sp2_type, sp2_value = swing_points[1]  # Middle
-    sp3_idx, sp3_type, sp3_value = swing_points[2]  # Oldest
+    pattern = (int(sp_types[0]) << 1) | int(sp_types[2])
+    sp1_idx, sp2_idx = int(sp_indices[0]), int(sp_indices[1])
     
     # Step 3: Check for FVGs ONLY between 1st and 2nd swing points (as per spec)
-    
-    if trend == 'bullish' and sp3_type == 'SH' and sp1_type == 'SH':
+    if trend == 'bullish' and pattern == PATTERN_SH_SH:
         # Pattern: SH -> SL -> SH (bullish)
         # Per spec: Search for bullish FVGs ONLY between 1st and 2nd swing points
-        fvgs = find_fvgs_in_range(candles, sp2_idx, sp1_idx, 'bullish')
+        # and take the TOPMOST one (highest bottom value)
+        fvg = find_optimal_fvg(candles, sp2_idx, sp1_idx, 'bullish')
         
-        if fvgs:
-            # Select the TOPMOST bullish FVG (highest bottom value)
-            fvg = select_optimal_fvg(fvgs, 'bullish')
-            return {
-                'trend': trend,
-                'swing_points': swing_points,
-                'fvg': fvg,
-                'target': sp1_value,
-                'stop_loss': sp2_value
-            }
-            
-    elif trend == 'bearish' and sp3_type == 'SL' and sp1_type == 'SL':
+    elif trend == 'bearish' and pattern == PATTERN_SL_SL:
         # Pattern: SL -> SH -> SL (bearish)
         # Per spec: Search for bearish FVGs ONLY between 1st and 2nd swing points
-        fvgs = find_fvgs_in_range(candles, sp2_idx, sp1_idx, 'bearish')
+        # and take the BOTTOMMOST one (lowest top value)
+        fvg = find_optimal_fvg(candles, sp2_idx, sp1_idx, 'bearish')
         
-        if fvgs:
-            # Select the BOTTOMMOST bearish FVG (lowest top value)
-            fvg = select_optimal_fvg(fvgs, 'bearish')
-            return {
-                'trend': trend,
-                'swing_points': swing_points,
-                'fvg': fvg,
-                'target': sp1_value,
-                'stop_loss': sp2_value
-            }
+    else:
+        return None
+    
+    if fvg:
+        return {
+            'trend': trend,
+            'swing_points': swing_points_to_tuples(sp_indices, sp_types, sp_values),
+            'fvg': fvg,
+            'target': float(sp_values[0]),
+            'stop_loss': float(sp_values[1])
+        }
     
-    return None
\ No newline at end of file
+    return None
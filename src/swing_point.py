@@ -1,9 +1,24 @@
 """Module for identifying swing points in price data."""
 
-from typing import List, Dict, Optional, Tuple
+from typing import List, Optional, Tuple, Union
+import numpy as np
+from numba import njit
+from candles import Candles
 
 
-def identify_swing_high(candles: List[Dict], index: int) -> bool:
+# Swing point type codes used by the compiled kernel
+SWING_HIGH = 0
+SWING_LOW = 1
+SWING_TYPE_NAMES = ('SH', 'SL')
+
+# (index, 'SH'/'SL', high/low value) of one swing point
+SwingPoint = Tuple[int, str, float]
+
+# (indices, type codes, values) arrays of the 3 swing points, most recent first
+SwingArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def identify_swing_high(candles: Candles, index: int) -> bool:
     """
     Identifies if the candle at given index is a swing high.
     
@@ -11,7 +26,7 @@ def identify_swing_high(candles: List[Dict], index: int) -> bool:
     both the previous and next candle's high.
     
     Args:
-        candles: List of candle dictionaries with 'high', 'low', 'close'
+        candles: Candles with 'high', 'low', 'close' arrays
         index: Index of the middle candle to check
         
     Returns:
@@ -20,14 +35,14 @@ def identify_swing_high(candles: List[Dict], index: int) -> bool:
     if index < 1 or index >= len(candles) - 1:
         return False
     
-    middle_high = candles[index]['high']
-    prev_high = candles[index - 1]['high']
-    next_high = candles[index + 1]['high']
+    middle_high = candles.high[index]
+    prev_high = candles.high[index - 1]
+    next_high = candles.high[index + 1]
     
     return middle_high > prev_high and middle_high > next_high
 
 
-def identify_swing_low(candles: List[Dict], index: int) -> bool:
+def identify_swing_low(candles: Candles, index: int) -> bool:
     """
     Identifies if the candle at given index is a swing low.
     
@@ -35,7 +50,7 @@ def identify_swing_low(candles: List[Dict], index: int) -> bool:
     both the previous and next candle's low.
     
     Args:
-        candles: List of candle dictionaries with 'high', 'low', 'close'
+        candles: Candles with 'high', 'low', 'close' arrays
         index: Index of the middle candle to check
         
     Returns:
@@ -44,14 +59,90 @@ def identify_swing_low(candles: List[Dict], index: int) -> bool:
     if index < 1 or index >= len(candles) - 1:
         return False
     
-    middle_low = candles[index]['low']
-    prev_low = candles[index - 1]['low']
-    next_low = candles[index + 1]['low']
+    middle_low = candles.low[index]
+    prev_low = candles.low[index - 1]
+    next_low = candles.low[index + 1]
     
     return middle_low < prev_low and middle_low < next_low
 
 
-def find_three_swing_points(candles: List[Dict]) -> Optional[List[Tuple[int, str, float]]]:
+@njit(cache=True)
+def _find_three_swing_points_kernel(highs: np.ndarray, lows: np.ndarray, stop: int = 0) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compiled backward scan behind find_three_swing_points.
+    
+    Candles are checked from the second-to-last one down to, but excluding,
+    index `stop`, so a positive `stop` only scans the most recent bars.
+    
+    Returns:
+        Tuple (count, indices, types, values) where the arrays have room for
+        3 swing points and only the first `count` entries are filled
+    """
+    indices = np.empty(3, dtype=np.int64)
+    types = np.empty(3, dtype=np.int8)
+    values = np.empty(3, dtype=np.float64)
+    count = 0
+    last_type = -1
+    
+    for i in range(len(highs) - 2, stop, -1):
+        if highs[i] > highs[i - 1] and highs[i] > highs[i + 1]:
+            if last_type != SWING_HIGH:  # Ensure alternating
+                indices[count] = i
+                types[count] = SWING_HIGH
+                values[count] = highs[i]
+                last_type = SWING_HIGH
+                count += 1
+        elif lows[i] < lows[i - 1] and lows[i] < lows[i + 1]:
+            if last_type != SWING_LOW:  # Ensure alternating
+                indices[count] = i
+                types[count] = SWING_LOW
+                values[count] = lows[i]
+                last_type = SWING_LOW
+                count += 1
+        
+        if count == 3:
+            break
+    
+    return count, indices, types, values
+
+
+def find_swing_point_arrays(candles: Candles, stop: int = 0, partial: bool = False) -> Union[Optional[SwingArrays], Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Finds 3 alternating swing points and returns them as arrays.
+    
+    Same search as find_three_swing_points, but keeps the kernel's array output
+    so callers can branch on the integer type codes (SWING_HIGH / SWING_LOW).
+    
+    Args:
+        candles: Candles (oldest to newest)
+        stop: Index the backward scan stops at (excluded), so a positive
+            value only scans the most recent bars
+        partial: Return whatever was found instead of None when fewer than
+            3 swing points are found
+        
+    Returns:
+        Tuple (indices, types, values) of length-3 arrays, most recent first,
+        or None if 3 alternating swing points cannot be found. With
+        partial=True, a tuple (count, indices, types, values) where only the
+        first `count` entries are set
+    """
+    count, indices, types, values = _find_three_swing_points_kernel(candles.high, candles.low, stop)
+    
+    if partial:
+        return count, indices, types, values
+    if count < 3:
+        return None
+    return indices, types, values
+
+
+def swing_points_to_tuples(indices: np.ndarray, types: np.ndarray, values: np.ndarray) -> List[SwingPoint]:
+    """
+    Converts swing point arrays into [(index, type, value), ...] tuples.
+    """
+    return [(int(indices[k]), SWING_TYPE_NAMES[types[k]], float(values[k])) for k in range(len(indices))]
+
+
+def find_three_swing_points(candles: Candles) -> Optional[List[SwingPoint]]:
     """
     Finds 3 alternating swing points moving backwards from most recent closed candle.
     
@@ -59,7 +150,7 @@ def find_three_swing_points(candles: List[Dict]) -> Optional[List[Tuple[int, str
     3 swing points that alternate between highs and lows (e.g., SH->SL->SH or SL->SH->SL).
     
     Args:
-        candles: List of candle dictionaries (oldest to newest)
+        candles: Candles (oldest to newest)
         
     Returns:
         List of tuples [(index, type, value), ...] where:
@@ -68,24 +159,8 @@ def find_three_swing_points(candles: List[Dict]) -> Optional[List[Tuple[int, str
         - value: the high/low price value
         Returns None if 3 alternating swing points cannot be found
     """
-    swing_points = []
-    last_type = None
+    swing_arrays = find_swing_point_arrays(candles)
     
-    # Start from second-to-last candle (most recent closed candle)
-    # Go backwards to find swing points
-    for i in range(len(candles) - 2, 0, -1):
-        if len(swing_points) >= 3:
-            break
-            
-        if identify_swing_high(candles, i):
-            if last_type != 'SH':  # Ensure alternating
-                swing_points.append((i, 'SH', candles[i]['high']))
-                last_type = 'SH'
-        elif identify_swing_low(candles, i):
-            if last_type != 'SL':  # Ensure alternating
-                swing_points.append((i, 'SL', candles[i]['low']))
-                last_type = 'SL'
-    
-    if len(swing_points) == 3:
-        return swing_points
-    return None
\ No newline at end of file
+    if swing_arrays is None:
+        return None
+    return swing_points_to_tuples(*swing_arrays)
@@ -1,101 +1,258 @@
 """Script to fetch all available tickers from various markets and save to CSV."""
 
+import functools
+import io
+import os
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+import numpy as np
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import time
+from singleflight import SingleFlight
 
 
+# NASDAQ Trader symbol directories (HTTPS mirror of the ftp://ftp.nasdaqtrader.com files)
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/symdir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/symdir/otherlisted.txt"
+
+# Plain alphabetic symbols; excludes test issues, units, warrants and the file footer
+_SYM_RE = re.compile(r'[A-Z]+')
+
+# Markets are fetched in parallel, so limit concurrent requests per host instead
+_host_limits = defaultdict(lambda: threading.Semaphore(2))
+_host_limits_lock = threading.Lock()
+
+# Concurrent first downloads of the same URL share one request
+_inflight = SingleFlight()
+
+# Downloaded files by URL: url -> (downloaded_at, body)
+_downloads = {}
+DOWNLOAD_TTL = timedelta(minutes=10)
+
+# Values of the Exchange column, stored as a categorical
+EXCHANGES = ['NASDAQ', 'NYSE', 'AMEX', 'S&P500', 'NSE', 'BSE', 'CRYPTO', 'FOREX']
+
+# NSE serves its API only to sessions holding the cookies set by its home page
+NSE_HOME_URL = "https://www.nseindia.com"
+NSE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Accept': '*/*',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Reused across calls so the cookies and connections survive
+_NSE_SESSION = requests.Session()
+_NSE_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_NSE_SESSION.headers.update(NSE_HEADERS)
+
+# Market entry without a data source yet, skipped by fetch_all_tickers
+_NOT_IMPLEMENTED = object()
+
+# Per-day snapshots written by disk_memo
+CACHE_DIR = Path.home() / '.cache' / 'ticker_fetcher'
+
+# Progress lines of the fetchers fetch_all_tickers runs in worker threads
+_progress = threading.local()
+
+
+def _log(message):
+    """Print a progress line, or hold it for fetch_all_tickers to print in one piece."""
+    lines = getattr(_progress, 'lines', None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+
+def _run_with_progress(fn):
+    """Run a market fetcher and return (DataFrame, progress lines) instead of printing."""
+    _progress.lines = []
+    try:
+        return fn(), _progress.lines
+    finally:
+        del _progress.lines
+
+
+def disk_memo(ttl):
+    """
+    Cache a market fetcher's DataFrame on disk as <name>-<YYYYMMDD>.parquet.
+    
+    Today's file is reused while it is younger than `ttl`; otherwise the
+    fetcher runs again and replaces it. Empty results (failed fetches) are
+    never written.
+    
+    Args:
+        ttl: timedelta after which a snapshot is refetched
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper():
+            path = CACHE_DIR / f"{func.__name__}-{datetime.now().strftime('%Y%m%d')}.parquet"
+            try:
+                if time.time() - path.stat().st_mtime < ttl.total_seconds():
+                    return pd.read_parquet(path)
+            except (OSError, ValueError):
+                pass  # missing or unreadable, fetch again
+            
+            df = func()
+            if not df.empty:
+                try:
+                    _write_snapshot(df, path, func.__name__)
+                except (OSError, ValueError) as e:
+                    _log(f"  Could not cache {func.__name__}: {e}")
+            return df
+        return wrapper
+    return decorator
+
+
+def _write_snapshot(df, path, name):
+    """Atomically write a snapshot and drop the older ones of the same fetcher."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    
+    for old_path in CACHE_DIR.glob(f"{name}-*.parquet"):
+        if old_path != path:
+            old_path.unlink(missing_ok=True)
+
+
+def _download(url):
+    """
+    Download a URL and return the raw response body, reused for DOWNLOAD_TTL.
+    
+    NYSE and AMEX both read otherlisted.txt, so caching the bytes turns
+    their two downloads into one. The bytes expire well before the disk_memo
+    snapshots, so refreshing those always sees the current files.
+    """
+    entry = _downloads.get(url)
+    if entry is not None and time.time() - entry[0] < DOWNLOAD_TTL.total_seconds():
+        return entry[1]
+    
+    body = _inflight.do(url, _get, url)
+    _downloads[url] = (time.time(), body)
+    return body
+
+
+@functools.lru_cache(maxsize=1)
+def _warm_nse_cookies():
+    """Load the NSE home page once per process so the session holds the API cookies."""
+    _NSE_SESSION.get(NSE_HOME_URL, timeout=10)
+    time.sleep(0.2)
+
+
+def _get(url):
+    """Fetch a URL while holding its host's request slot."""
+    with _host_limits_lock:
+        limit = _host_limits[urlsplit(url).netloc]
+    
+    with limit:
+        response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+@disk_memo(ttl=timedelta(hours=12))
 def fetch_nasdaq_tickers():
     """Fetch all NASDAQ listed tickers."""
-    print("Fetching NASDAQ tickers...")
+    _log("Fetching NASDAQ tickers...")
     try:
         # NASDAQ trader API
-        url = "ftp://ftp.nasdaqtrader.com/symboldirectory/nasdaqlisted.txt"
-        df = pd.read_csv(url, sep='|')
-        df = df[df['Symbol'].str.contains(r'^[A-Z]+$', na=False)]
+        df = pd.read_csv(io.BytesIO(_download(NASDAQ_LISTED_URL)), sep='|')
+        df = df[df['Symbol'].str.fullmatch(_SYM_RE, na=False)]
         df = df[['Symbol', 'Security Name']]
         df['Exchange'] = 'NASDAQ'
-        print(f"  Found {len(df)} NASDAQ tickers")
+        _log(f"  Found {len(df)} NASDAQ tickers")
         return df
     except Exception as e:
-        print(f"  Error fetching NASDAQ tickers: {e}")
+        _log(f"  Error fetching NASDAQ tickers: {e}")
         return pd.DataFrame()
 
 
+@disk_memo(ttl=timedelta(hours=12))
 def fetch_nyse_tickers():
     """Fetch all NYSE listed tickers."""
-    print("Fetching NYSE tickers...")
+    _log("Fetching NYSE tickers...")
     try:
         # NYSE listed from NASDAQ trader
-        url = "ftp://ftp.nasdaqtrader.com/symboldirectory/otherlisted.txt"
-        df = pd.read_csv(url, sep='|')
+        df = pd.read_csv(io.BytesIO(_download(OTHER_LISTED_URL)), sep='|')
         df = df[df['Exchange'] == 'N']  # N = NYSE
-        df = df[df['ACT Symbol'].str.contains(r'^[A-Z]+$', na=False)]
+        df = df[df['ACT Symbol'].str.fullmatch(_SYM_RE, na=False)]
         df = df[['ACT Symbol', 'Security Name']]
         df.columns = ['Symbol', 'Security Name']
         df['Exchange'] = 'NYSE'
-        print(f"  Found {len(df)} NYSE tickers")
+        _log(f"  Found {len(df)} NYSE tickers")
         return df
     except Exception as e:
-        print(f"  Error fetching NYSE tickers: {e}")
+        _log(f"  Error fetching NYSE tickers: {e}")
         return pd.DataFrame()
 
 
+@disk_memo(ttl=timedelta(hours=12))
 def fetch_amex_tickers():
     """Fetch all AMEX listed tickers."""
-    print("Fetching AMEX tickers...")
+    _log("Fetching AMEX tickers...")
     try:
-        url = "ftp://ftp.nasdaqtrader.com/symboldirectory/otherlisted.txt"
-        df = pd.read_csv(url, sep='|')
+        # Same file as NYSE, served from the download cache
+        df = pd.read_csv(io.BytesIO(_download(OTHER_LISTED_URL)), sep='|')
         df = df[df['Exchange'] == 'A']  # A = AMEX
-        df = df[df['ACT Symbol'].str.contains(r'^[A-Z]+$', na=False)]
+        df = df[df['ACT Symbol'].str.fullmatch(_SYM_RE, na=False)]
         df = df[['ACT Symbol', 'Security Name']]
         df.columns = ['Symbol', 'Security Name']
         df['Exchange'] = 'AMEX'
-        print(f"  Found {len(df)} AMEX tickers")
+        _log(f"  Found {len(df)} AMEX tickers")
         return df
     except Exception as e:
-        print(f"  Error fetching AMEX tickers: {e}")
+        _log(f"  Error fetching AMEX tickers: {e}")
         return pd.DataFrame()
 
 
+@disk_memo(ttl=timedelta(hours=12))
 def fetch_sp500_tickers():
     """Fetch S&P 500 component tickers from Wikipedia."""
-    print("Fetching S&P 500 tickers...")
+    _log("Fetching S&P 500 tickers...")
     try:
         url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
-        tables = pd.read_html(url)
+        # Only parse the constituents table, with the fast lxml parser
+        tables = pd.read_html(url, attrs={'id': 'constituents'}, flavor='lxml')
         df = tables[0]
         df = df[['Symbol', 'Security', 'GICS Sector']]
         df.columns = ['Symbol', 'Security Name', 'Sector']
         df['Exchange'] = 'S&P500'
-        print(f"  Found {len(df)} S&P 500 tickers")
+        _log(f"  Found {len(df)} S&P 500 tickers")
         return df
     except Exception as e:
-        print(f"  Error fetching S&P 500 tickers: {e}")
+        _log(f"  Error fetching S&P 500 tickers: {e}")
         return pd.DataFrame()
 
 
+@disk_memo(ttl=timedelta(hours=12))
 def fetch_nse_india_tickers():
     """Fetch NSE India tickers."""
-    print("Fetching NSE India tickers...")
+    _log("Fetching NSE India tickers...")
     try:
         # NSE Equity List
         url = "https://www.nseindia.com/api/equity-stockIndices?index=SECURITIES%20IN%20F%26O"
-        headers = {
-            'User-Agent': 'Mozilla/5.0',
-            'Accept': '*/*',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
         
-        # Create session and get cookies
-        session = requests.Session()
-        session.get("https://www.nseindia.com", headers=headers)
-        time.sleep(1)
+        _warm_nse_cookies()
+        response = _NSE_SESSION.get(url, timeout=10)
+        if response.status_code == 403:
+            # Cookies expired, fetch fresh ones and retry once
+            _NSE_SESSION.cookies.clear()
+            _warm_nse_cookies.cache_clear()
+            _warm_nse_cookies()
+            response = _NSE_SESSION.get(url, timeout=10)
         
-        response = session.get(url, headers=headers)
-        data = response.json()
+        data = orjson.loads(response.content)
         
         tickers = []
         if 'data' in data:
@@ -107,16 +264,16 @@ def fetch_nse_india_tickers():
                 })
         
         df = pd.DataFrame(tickers)
-        print(f"  Found {len(df)} NSE tickers")
+        _log(f"  Found {len(df)} NSE tickers")
         return df
     except Exception as e:
-        print(f"  Error fetching NSE tickers: {e}")
+        _log(f"  Error fetching NSE tickers: {e}")
         return pd.DataFrame()
 
 
 def fetch_bse_india_tickers():
     """Fetch BSE India tickers (using popular BSE 500 components)."""
-    print("Fetching BSE India tickers...")
+    _log("Fetching BSE India tickers...")
     try:
         # Alternative: Fetch from a known list or API
         # For now, we'll create a sample structure
@@ -124,16 +281,16 @@ def fetch_bse_india_tickers():
         
         # This is a placeholder - you'll need a proper BSE data source
         df = pd.DataFrame()
-        print(f"  BSE ticker fetching not fully implemented")
+        _log(f"  BSE ticker fetching not fully implemented")
         return df
     except Exception as e:
-        print(f"  Error fetching BSE tickers: {e}")
+        _log(f"  Error fetching BSE tickers: {e}")
         return pd.DataFrame()
 
 
 def fetch_crypto_tickers():
     """Fetch popular cryptocurrency tickers."""
-    print("Fetching Crypto tickers...")
+    _log("Fetching Crypto tickers...")
     try:
         # Popular cryptocurrencies with their yfinance symbols
         cryptos = [
@@ -150,16 +307,16 @@ def fetch_crypto_tickers():
         ]
         
         df = pd.DataFrame(cryptos, columns=['Symbol', 'Security Name', 'Exchange'])
-        print(f"  Found {len(df)} Crypto tickers")
+        _log(f"  Found {len(df)} Crypto tickers")
         return df
     except Exception as e:
-        print(f"  Error fetching Crypto tickers: {e}")
+        _log(f"  Error fetching Crypto tickers: {e}")
         return pd.DataFrame()
 
 
 def fetch_forex_pairs():
     """Fetch popular forex pairs."""
-    print("Fetching Forex pairs...")
+    _log("Fetching Forex pairs...")
     try:
         forex_pairs = [
             ('EURUSD=X', 'EUR/USD', 'FOREX'),
@@ -175,10 +332,10 @@ def fetch_forex_pairs():
         ]
         
         df = pd.DataFrame(forex_pairs, columns=['Symbol', 'Security Name', 'Exchange'])
-        print(f"  Found {len(df)} Forex pairs")
+        _log(f"  Found {len(df)} Forex pairs")
         return df
     except Exception as e:
-        print(f"  Error fetching Forex pairs: {e}")
+        _log(f"  Error fetching Forex pairs: {e}")
         return pd.DataFrame()
 
 
@@ -189,14 +346,17 @@ def fetch_all_tickers(markets=None):
     Args:
         markets: List of markets to fetch. If None, fetches all.
                 Options: 'nasdaq', 'nyse', 'amex', 'sp500', 'nse', 'bse', 'crypto', 'forex'
+                ('bse' is accepted but skipped until it has a data source)
     
     Returns:
-        pd.DataFrame: Combined DataFrame of all tickers
+        pd.DataFrame: Combined DataFrame of all tickers. Market lists come from
+            the disk_memo snapshots while they are fresh, so repeated calls do
+            not refetch them. The fetch time is in df.attrs['last_updated']
+            rather than a column.
     """
     if markets is None:
         markets = ['nasdaq', 'nyse', 'amex', 'sp500', 'nse', 'crypto', 'forex']
-    
-    all_dfs = []
+    markets = list(dict.fromkeys(markets))  # each market once, order kept
     
     market_functions = {
         'nasdaq': fetch_nasdaq_tickers,
@@ -204,26 +364,41 @@ def fetch_all_tickers(markets=None):
         'amex': fetch_amex_tickers,
         'sp500': fetch_sp500_tickers,
         'nse': fetch_nse_india_tickers,
-        'bse': fetch_bse_india_tickers,
+        'bse': _NOT_IMPLEMENTED,  # see fetch_bse_india_tickers
         'crypto': fetch_crypto_tickers,
         'forex': fetch_forex_pairs,
     }
     
-    for market in markets:
-        if market in market_functions:
-            df = market_functions[market]()
-            if not df.empty:
-                all_dfs.append(df)
-            time.sleep(0.5)  # Rate limiting
+    # Fetchers are I/O bound, run them all at once
+    dfs_by_market = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {}
+        for market in markets:
+            fn = market_functions.get(market)
+            if fn is None or fn is _NOT_IMPLEMENTED:
+                continue
+            futures[executor.submit(_run_with_progress, fn)] = market
+        # Print from here so the lines of different markets do not interleave
+        for future in as_completed(futures):
+            df, lines = future.result()
+            if lines:
+                print("\n".join(lines))
+            dfs_by_market[futures[future]] = df
+    
+    # Concatenate in the requested market order, so the first market listing
+    # a symbol keeps it on every run
+    all_dfs = [dfs_by_market[market] for market in markets
+               if market in dfs_by_market and not dfs_by_market[market].empty]
     
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
         
         # Remove duplicates
-        combined_df = combined_df.drop_duplicates(subset=['Symbol'])
+        combined_df = combined_df.drop_duplicates(subset=['Symbol'], ignore_index=True)
+        combined_df['Exchange'] = pd.Categorical(combined_df['Exchange'], categories=EXCHANGES)
         
-        # Add timestamp
-        combined_df['Last Updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # One timestamp for the whole list, written out as a column on save
+        combined_df.attrs['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         return combined_df
     
@@ -232,29 +407,39 @@ def fetch_all_tickers(markets=None):
 
 def get_tickers_list(markets=None):
     """
-    Get tickers as a simple list of symbols.
+    Get tickers as a flat array of symbols.
 
     Args:
         markets: List of markets to include. Available options:
             'nasdaq', 'nyse', 'amex', 'sp500', 'nse', 'bse', 'crypto', 'forex'
 
     Returns:
-        list: List of ticker symbols as strings
+        np.ndarray: 1-D object array of ticker symbols as strings, without
+            copying the column where possible. Call .tolist() if a Python
+            list is needed (this function returned one before).
     """
     df = fetch_all_tickers(markets)
     if df.empty:
-        return []
-    return df['Symbol'].tolist()
+        return np.empty(0, dtype=object)
+    return df['Symbol'].to_numpy(dtype=object, copy=False)
 
-def save_tickers_to_csv(markets=None, filename=None):
+def save_tickers_to_csv(markets=None, filename=None, output_format='both'):
     """
-    Main function to fetch and save tickers to CSV.
+    Main function to fetch and save tickers to CSV and/or parquet.
     
     Args:
         markets: List of markets to include. Available options:
             'nasdaq', 'nyse', 'amex', 'sp500', 'nse', 'bse', 'crypto', 'forex'
-        filename: Output filename. If None, generates timestamp-based name
+        filename: Output CSV filename. If None, generates timestamp-based name.
+            The parquet file uses the same name with a .parquet extension.
+        output_format: 'csv', 'parquet' (ZSTD-compressed) or 'both'
+    
+    Returns:
+        Path of the CSV file, or of the parquet file when only that is written
     """
+    if output_format not in ('csv', 'parquet', 'both'):
+        raise ValueError(f"output_format must be 'csv', 'parquet' or 'both', got {output_format!r}")
+    
     print("\n" + "="*60)
     print("Ticker Fetcher - Market Data Retrieval")
     print("="*60 + "\n")
@@ -271,22 +456,34 @@ def save_tickers_to_csv(markets=None, filename=None):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'tickers_{timestamp}.csv'
     
-    # Save to CSV
-    df.to_csv(filename, index=False)
+    parquet_filename = os.path.splitext(filename)[0] + '.parquet'
+    
+    # Files keep the 'Last Updated' column they always had
+    df = df.assign(**{'Last Updated': df.attrs['last_updated']})
+    saved = []
+    
+    if output_format in ('csv', 'both'):
+        df.to_csv(filename, index=False)
+        saved.append(filename)
+    
+    if output_format in ('parquet', 'both'):
+        df.to_parquet(parquet_filename, index=False, compression='zstd')
+        saved.append(parquet_filename)
     
     print("\n" + "="*60)
-    print(f"✅ Successfully saved {len(df)} tickers to '{filename}'")
+    print(f"✅ Successfully saved {len(df)} tickers to {', '.join(f'{name!r}' for name in saved)}")
     print("="*60)
     
     # Print summary by exchange
     print("\nSummary by Exchange:")
     print("-" * 60)
     exchange_counts = df['Exchange'].value_counts()
+    exchange_counts = exchange_counts[exchange_counts > 0]  # skip unused categories
     for exchange, count in exchange_counts.items():
         print(f"  {exchange:15s}: {count:5d} tickers")
     print("-" * 60)
     
-    return filename
+    return saved[0]
 
 if __name__ == "__main__":
     # Example usage:
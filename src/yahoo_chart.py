@@ -0,0 +1,151 @@
+"""Direct client for Yahoo's chart endpoint, parsed straight into Candles."""
+
+from types import MappingProxyType
+from typing import Dict, Tuple
+from urllib.parse import quote
+import numpy as np
+import orjson
+import pandas as pd
+import requests
+from candles import Candles
+
+
+CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{ticker}'
+
+# Intervals the endpoint does not serve: interval -> (base interval, bin size in seconds)
+BINNED_INTERVALS = MappingProxyType({
+    '4h': ('1h', 4 * 3600)
+})
+
+
+def chart_request(ticker: str, interval: str, range_: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Builds the URL and query parameters for a chart request.
+
+    Args:
+        ticker: Ticker symbol
+        interval: Candle interval (e.g., '1h', '4h', '1d')
+        range_: Yahoo range (e.g., '6mo', '1y')
+
+    Returns:
+        Tuple of (url, params)
+    """
+    base_interval = BINNED_INTERVALS.get(interval, (interval, None))[0]
+    url = CHART_URL.format(ticker=quote(ticker, safe=''))
+    return url, {'interval': base_interval, 'range': range_}
+
+
+def parse_chart(content: bytes, interval: str) -> Candles:
+    """
+    Parses a chart response body into Candles without building a DataFrame.
+
+    Prices are adjusted for splits and dividends when Yahoo returns an
+    adjusted close, like Ticker.history(auto_adjust=True).
+
+    Args:
+        content: Raw JSON response body
+        interval: Interval the request was built for with chart_request
+
+    Returns:
+        Candles with UTC timestamps, empty if the range holds no candles
+
+    Raises:
+        KeyError: If the payload is not a chart result
+    """
+    chart = orjson.loads(content)['chart']
+    if not chart.get('result'):
+        raise KeyError(f"no chart result: {chart.get('error')}")
+
+    result = chart['result'][0]
+    if 'timestamp' not in result:
+        return _empty_candles()
+
+    indicators = result['indicators']
+    q = indicators['quote'][0]
+    ts = np.asarray(result['timestamp'], dtype='datetime64[s]')
+    opens = np.asarray(q['open'], dtype=np.float64)
+    highs = np.asarray(q['high'], dtype=np.float64)
+    lows = np.asarray(q['low'], dtype=np.float64)
+    closes = np.asarray(q['close'], dtype=np.float64)
+    volumes = np.asarray(q['volume'], dtype=np.float64)
+
+    adjclose = indicators.get('adjclose')
+    if adjclose:
+        ratio = np.asarray(adjclose[0]['adjclose'], dtype=np.float64) / closes
+        opens, highs, lows, closes = opens * ratio, highs * ratio, lows * ratio, closes * ratio
+
+    # Yahoo pads gaps with nulls, which arrive here as NaN
+    valid = np.isfinite(opens) & np.isfinite(highs) & np.isfinite(lows) & np.isfinite(closes)
+    candles = Candles(
+        ts=ts[valid],
+        open=opens[valid],
+        high=highs[valid],
+        low=lows[valid],
+        close=closes[valid],
+        volume=volumes[valid]
+    )
+
+    if interval in BINNED_INTERVALS and len(candles):
+        tz = result['meta'].get('exchangeTimezoneName', 'UTC')
+        candles = _bin_candles(candles, tz, BINNED_INTERVALS[interval][1])
+    return candles
+
+
+def fetch_chart(session: requests.Session, ticker: str, interval: str, range_: str) -> Candles:
+    """
+    Fetches candles for a ticker from the chart endpoint.
+
+    Args:
+        session: Shared requests.Session
+        ticker: Ticker symbol
+        interval: Candle interval (e.g., '1h', '4h', '1d')
+        range_: Yahoo range (e.g., '6mo', '1y')
+
+    Returns:
+        Candles with UTC timestamps, empty if the range holds no candles
+
+    Raises:
+        KeyError: If the payload is not a chart result
+        requests.HTTPError: If Yahoo answers with an error status
+    """
+    url, params = chart_request(ticker, interval, range_)
+    response = session.get(url, params=params, headers={'Accept-Encoding': 'gzip'}, timeout=10)
+    response.raise_for_status()
+    return parse_chart(response.content, interval)
+
+
+def _bin_candles(candles: Candles, tz: str, seconds: int) -> Candles:
+    """
+    Aggregates candles into bins of `seconds` starting at the exchange's local midnight.
+
+    Matches resampling a localized Ticker.history frame with label='left',
+    closed='left': bins are anchored at the first day's midnight and step in
+    absolute time from there. Empty bins are skipped.
+    """
+    origin = pd.Timestamp(candles.ts[0]).tz_localize('UTC').tz_convert(tz).normalize()
+    origin = np.datetime64(origin.tz_convert('UTC').tz_localize(None), 's')
+    bins = (candles.ts - origin).astype(np.int64) // seconds
+
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], len(bins)] - 1
+
+    return Candles(
+        ts=origin + (bins[starts] * seconds).astype('timedelta64[s]'),
+        open=candles.open[starts],
+        high=np.maximum.reduceat(candles.high, starts),
+        low=np.minimum.reduceat(candles.low, starts),
+        close=candles.close[ends],
+        volume=np.add.reduceat(np.nan_to_num(candles.volume), starts)
+    )
+
+
+def _empty_candles() -> Candles:
+    empty = np.empty(0, dtype=np.float64)
+    return Candles(
+        ts=np.empty(0, dtype='datetime64[s]'),
+        open=empty,
+        high=empty,
+        low=empty,
+        close=empty,
+        volume=empty
+    )
@@ -0,0 +1,78 @@
+"""Shared HTTP session for Yahoo requests."""
+
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from yfinance._http import HAS_CURL_CFFI
+except ImportError:
+    # Older yfinance releases require curl_cffi and reject plain sessions
+    HAS_CURL_CFFI = True
+
+
+# Browser User-Agent, Yahoo rejects the default python-requests one
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/124.0 Safari/537.36')
+
+# Process-wide session so every worker thread reuses the same connection pool
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """
+    Builds a session with connection pooling and automatic retries.
+
+    Returns:
+        requests.Session mounted with a pooled, retrying HTTPAdapter
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"]
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared session, creating it on first use.
+
+    Returns:
+        The process-wide requests.Session
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get_yfinance_session() -> Optional[requests.Session]:
+    """
+    Returns the session to pass to yfinance, or None to keep yfinance's own.
+
+    With curl_cffi installed, yfinance's default session impersonates a
+    browser's TLS fingerprint, which a plain requests.Session cannot do and
+    Yahoo may rate-limit. The shared session is then left to the direct
+    chart requests.
+
+    Returns:
+        The shared session if yfinance falls back to requests, else None
+    """
+    return None if HAS_CURL_CFFI else get_session()
\ No newline at end of file